@@ -15,17 +15,36 @@ Usage:
 """
 
 import argparse
+import json
 import pickle
+import re
+import shutil
 import sys
 from pathlib import Path
 
 try:
-    from rdflib import Graph
+    import rdflib
+    from rdflib import BNode, Graph, Literal, URIRef
+    from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+    from rdflib.plugins.sparql import prepareQuery
 except ImportError:
     print("Error: rdflib is not installed.")
     print("Install it with: pip install -r requirements.txt")
     sys.exit(1)
 
+try:
+    # Registers the "Oxigraph" rdflib store plugin
+    import oxrdflib
+except ImportError:
+    oxrdflib = None
+
+try:
+    # Optional: columnar Arrow cache instead of pickle
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:
+    pa = None
+
 
 # Paths relative to this script
 SCRIPT_DIR = Path(__file__).parent
@@ -37,18 +56,185 @@ RDFLIB_QUERIES_DIR = QUERIES_DIR / "rdflib"
 # Default ontology file (OWL/XML format with pickle caching for stability)
 DEFAULT_ONTOLOGY = SOURCES_DIR / "ontology-semantic-canon.owl"
 
+# results.vars may not be iterable with rdflib < 7 on Python 3.12+; decide once
+# at import whether the header needs the defensive path
+_RDFLIB_VERSION = tuple(int(part) for part in re.match(r"(\d+)\.(\d+)", rdflib.__version__).groups())
+VARS_SAFE = sys.version_info < (3, 12) or _RDFLIB_VERSION >= (7, 0)
+
+# Result rows buffered per stdout write when printing SELECT results
+OUTPUT_BATCH_ROWS = 4096
+
+# rdflib parser names by ontology file extension
+FORMAT_MAP = {
+    ".ttl": "turtle",
+    ".owl": "xml",
+    ".owx": "xml",
+    ".rdf": "xml",
+    ".n3": "n3",
+    ".nt": "nt",
+}
+
+
+def load_oxigraph_store(ontology_path: Path) -> Graph:
+    """Open the ontology from a persistent Oxigraph store, building it if stale.
+
+    The store is a directory next to the ontology file, stamped with the
+    ontology's modification time. Reopening it maps the on-disk store instead
+    of rebuilding Python objects, and SPARQL queries run on Oxigraph's engine.
+    """
+    store_path = ontology_path.with_suffix(".oxigraph")
+    stamp_path = store_path / "source-mtime"
+    mtime = str(ontology_path.stat().st_mtime_ns)
+
+    # Pin the store's default graph so triples survive reopening
+    g = Graph(store="Oxigraph", identifier=DATASET_DEFAULT_GRAPH_ID)
+    # The stamp is "<mtime> <triple count>"; counting an Oxigraph store scans it
+    stamp = stamp_path.read_text().split() if stamp_path.exists() else []
+    if stamp[:1] == [mtime]:
+        print(f"Opening store {store_path.name}...")
+        g.open(str(store_path))
+        count = int(stamp[1]) if len(stamp) > 1 else len(g)
+        print(f"Loaded {count} triples from store.")
+        return g
+
+    # Missing or stale store: rebuild from the ontology file
+    shutil.rmtree(store_path, ignore_errors=True)
+    print(f"Building store {store_path.name} from {ontology_path.name}...")
+    g.open(str(store_path), create=True)
+    rdf_format = FORMAT_MAP.get(ontology_path.suffix.lower(), "turtle")
+    g.parse(str(ontology_path), format=rdf_format)
+    count = len(g)
+    stamp_path.write_text(f"{mtime} {count}")
+    print(f"Loaded {count} triples.")
+    return g
+
+
+# Term kinds in the Arrow cache's term dictionary
+TERM_URI, TERM_BNODE, TERM_LITERAL = 0, 1, 2
+
+
+def save_arrow_cache(g: Graph, ontology_path: Path) -> None:
+    """Save the graph as dictionary-encoded Arrow tables.
+
+    Every distinct term is stored once in a terms table, and the triples are
+    three int32 columns of term ids. The triples table's metadata records the
+    ontology's file name, modification time and namespace bindings; the
+    cache files are named by stem, so the name tells apart formats of the
+    same ontology.
+    """
+    triples_path = ontology_path.with_suffix(".triples.feather")
+    terms_path = ontology_path.with_suffix(".terms.feather")
+    try:
+        print(f"Saving to cache {triples_path.name}...")
+        term_ids = {}
+        columns = ([], [], [])
+        for triple in g:
+            for column, term in zip(columns, triple):
+                column.append(term_ids.setdefault(term, len(term_ids)))
+
+        kinds, values, datatypes, langs = [], [], [], []
+        for term in term_ids:
+            if isinstance(term, Literal):
+                kinds.append(TERM_LITERAL)
+                datatypes.append(str(term.datatype) if term.datatype else None)
+                langs.append(term.language)
+            else:
+                kinds.append(TERM_BNODE if isinstance(term, BNode) else TERM_URI)
+                datatypes.append(None)
+                langs.append(None)
+            values.append(str(term))
+
+        terms = pa.table({
+            "kind": pa.array(kinds, pa.int8()),
+            "value": pa.array(values, pa.string()),
+            "datatype": pa.array(datatypes, pa.string()),
+            "lang": pa.array(langs, pa.string()),
+        })
+        triples = pa.table(
+            {name: pa.array(column, pa.int32()) for name, column in zip("spo", columns)},
+            metadata={
+                "source_name": ontology_path.name,
+                "source_mtime": str(ontology_path.stat().st_mtime_ns),
+                "namespaces": json.dumps({prefix: str(ns) for prefix, ns in g.namespaces()}),
+            },
+        )
+        feather.write_feather(terms, terms_path)
+        feather.write_feather(triples, triples_path)
+        print("Cache saved successfully.")
+    except Exception as e:
+        print(f"Warning: Could not save cache: {e}")
+
+
+def load_arrow_cache(ontology_path: Path) -> Graph | None:
+    """Load the graph from the Arrow cache, or return None if missing or stale."""
+    triples_path = ontology_path.with_suffix(".triples.feather")
+    terms_path = ontology_path.with_suffix(".terms.feather")
+    if not (triples_path.exists() and terms_path.exists()):
+        return None
+
+    try:
+        print(f"Loading from cache {triples_path.name}...")
+        triples = feather.read_table(triples_path, memory_map=True)
+        metadata = triples.schema.metadata or {}
+        if (metadata.get(b"source_name") != ontology_path.name.encode()
+                or metadata.get(b"source_mtime") != str(ontology_path.stat().st_mtime_ns).encode()):
+            print("Cache is out of date, parsing ontology...")
+            return None
+
+        terms_table = feather.read_table(terms_path, memory_map=True)
+        terms = []
+        for kind, value, datatype, lang in zip(
+            *(terms_table.column(name).to_pylist() for name in ("kind", "value", "datatype", "lang"))
+        ):
+            if kind == TERM_LITERAL:
+                terms.append(Literal(value, lang=lang, datatype=datatype))
+            elif kind == TERM_BNODE:
+                terms.append(BNode(value))
+            else:
+                terms.append(URIRef(value))
+
+        g = Graph()
+        for prefix, namespace in json.loads(metadata.get(b"namespaces", b"{}")).items():
+            g.bind(prefix, namespace, override=True)
+        # Terms are well-formed by construction, so bypass Graph.addN's per-triple checks
+        g.store.addN(
+            (terms[s], terms[p], terms[o], g)
+            for s, p, o in zip(*(triples.column(name).to_pylist() for name in "spo"))
+        )
+        print(f"Loaded {triples.num_rows} triples from cache.")
+        return g
+    except (pa.ArrowException, OSError, ValueError, IndexError, KeyError) as e:
+        print(f"Cache load failed ({e}), parsing ontology...")
+        return None
+
 
 def load_ontology(ontology_path: Path = DEFAULT_ONTOLOGY) -> Graph:
-    """Load the ontology into an RDF graph, using pickle cache if available."""
+    """Load the ontology into an RDF graph.
+
+    Uses a persistent Oxigraph store when oxrdflib is installed. Otherwise
+    the parsed graph is cached as Arrow tables when pyarrow is installed,
+    or pickled as a fallback.
+    """
+    if oxrdflib is not None:
+        return load_oxigraph_store(ontology_path)
+
     cache_path = ontology_path.with_suffix(".pickle")
 
     # Try to load from cache first
-    if cache_path.exists():
+    if pa is not None:
+        g = load_arrow_cache(ontology_path)
+        if g is not None:
+            return g
+    elif cache_path.exists() and cache_path.stat().st_mtime_ns < ontology_path.stat().st_mtime_ns:
+        print(f"Cache {cache_path.name} is older than the ontology, parsing ontology...")
+    elif cache_path.exists():
         try:
             print(f"Loading from cache {cache_path.name}...")
             with open(cache_path, "rb") as f:
-                g = pickle.load(f)
-            print(f"Loaded {len(g)} triples from cache.")
+                cached = pickle.load(f)
+            # Caches store (graph, triple count); older caches hold just the graph
+            g, count = cached if isinstance(cached, tuple) else (cached, len(cached))
+            print(f"Loaded {count} triples from cache.")
             return g
         except Exception as e:
             print(f"Cache load failed ({e}), parsing ontology...")
@@ -57,25 +243,21 @@ def load_ontology(ontology_path: Path = DEFAULT_ONTOLOGY) -> Graph:
     g = Graph()
 
     # Determine format from extension
-    suffix = ontology_path.suffix.lower()
-    format_map = {
-        ".ttl": "turtle",
-        ".owl": "xml",
-        ".owx": "xml",
-        ".rdf": "xml",
-        ".n3": "n3",
-        ".nt": "nt",
-    }
-    rdf_format = format_map.get(suffix, "turtle")
+    rdf_format = FORMAT_MAP.get(ontology_path.suffix.lower(), "turtle")
 
     g.parse(str(ontology_path), format=rdf_format)
-    print(f"Loaded {len(g)} triples.")
+    count = len(g)
+    print(f"Loaded {count} triples.")
 
     # Save to cache for faster subsequent loads
+    if pa is not None:
+        save_arrow_cache(g, ontology_path)
+        return g
+
     try:
         print(f"Saving to cache {cache_path.name}...")
         with open(cache_path, "wb") as f:
-            pickle.dump(g, f)
+            pickle.dump((g, count), f)
         print("Cache saved successfully.")
     except Exception as e:
         print(f"Warning: Could not save cache: {e}")
@@ -100,10 +282,32 @@ def list_queries(semantic: bool = False) -> list[Path]:
     return queries
 
 
+# Parsed queries by text, reused when a query is run again in the same session
+_prepared_queries = {}
+
+
+def prepare_query(graph: Graph, query_text: str):
+    """Parse and translate a SPARQL query once per session.
+
+    rdflib's SPARQL parser dominates the cost of short queries, so reruns
+    from the interactive menu reuse the translated query. The graph's bound
+    prefixes are available to the query, as with graph.query().
+    """
+    query = _prepared_queries.get(query_text)
+    if query is None:
+        query = prepareQuery(query_text, initNs=dict(graph.namespaces()))
+        _prepared_queries[query_text] = query
+    return query
+
+
 def run_query(graph: Graph, query_text: str) -> None:
     """Execute a SPARQL query and print results."""
     try:
-        results = graph.query(query_text)
+        # Oxigraph parses and plans queries natively; rdflib gets a prepared query
+        if oxrdflib is not None:
+            results = graph.query(query_text)
+        else:
+            results = graph.query(prepare_query(graph, query_text))
 
         # Check if it's a CONSTRUCT query (returns a graph)
         if hasattr(results, 'graph') and results.graph is not None:
@@ -111,8 +315,14 @@ def run_query(graph: Graph, query_text: str) -> None:
             print(results.graph.serialize(format="turtle"))
         else:
             # SELECT query results
+            if VARS_SAFE:
+                if results.vars:
+                    # Print header
+                    header = " | ".join(str(var) for var in results.vars)
+                    print(f"\n{header}")
+                    print("-" * len(header))
             # Defensive check for results.vars (rdflib bug workaround)
-            if results.vars and hasattr(results.vars, '__iter__'):
+            elif results.vars and hasattr(results.vars, '__iter__'):
                 try:
                     # Print header
                     header = " | ".join(str(var) for var in results.vars)
@@ -123,20 +333,28 @@ def run_query(graph: Graph, query_text: str) -> None:
                     print("\n(Unable to display header due to rdflib bug)")
 
             count = 0
+            lines = []
             for row in results:
                 values = []
                 for val in row:
                     if val is None:
                         values.append("")
                     else:
-                        # Shorten URIs for readability
+                        # Shorten URIs for readability (local name after the last / or #)
                         val_str = str(val)
-                        if isinstance(val_str, str) and val_str.startswith("http"):
-                            val_str = val_str.split("/")[-1].split("#")[-1]
-                        values.append(str(val_str))
-                print(" | ".join(values))
+                        if val_str.startswith("http"):
+                            val_str = val_str.rpartition("/")[2].rpartition("#")[2]
+                        values.append(val_str)
+                lines.append(" | ".join(values))
                 count += 1
 
+                # Write rows in batches instead of one print() per row
+                if len(lines) >= OUTPUT_BATCH_ROWS:
+                    sys.stdout.write("\n".join(lines) + "\n")
+                    lines.clear()
+
+            if lines:
+                sys.stdout.write("\n".join(lines) + "\n")
             print(f"\n({count} results)")
 
     except Exception as e:
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Ontology Tools for Catholic Semantic Canon Ontology
+
+Runs the scripts in this directory as subcommands against a single loaded
+ontology graph, so running several tools parses the ontology only once.
+
+Usage:
+    python scripts patterns                  # Same as pattern_generator.py
+    python scripts ambiguous                 # Same as find_ambiguous_terms.py
+    python scripts all                       # Both, sharing one loaded graph
+    python scripts all --output out.json     # Options apply to each tool
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Make sibling scripts importable when run as `python scripts` or `python -m scripts`
+sys.path.insert(0, str(Path(__file__).parent))
+
+import find_ambiguous_terms  # noqa: E402
+import pattern_generator  # noqa: E402
+
+
+def run_patterns(args, graph=None) -> None:
+    """
+    Generate and write patterns, building the ontology indices only if needed.
+
+    When some root class is not in the subclass cache, the indices are built
+    from graph if given, otherwise loaded from the ontology file.
+    """
+    config = pattern_generator.load_config(args.config)
+    cache_path = None if args.no_cache else args.output.with_suffix(".cache.json")
+    patterns = pattern_generator.generate_patterns(
+        args.ontology, config, cache_path, jobs=args.jobs, graph=graph,
+        ignore_case=args.ignore_case, strict_subclass_path=args.strict_subclass_path
+    )
+    pattern_generator.write_patterns(patterns, args.output, build_ac=args.build_ac,
+                                     build_hs=args.build_hs)
+
+
+def main():
+    # Options shared by every subcommand
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--ontology", "-o",
+        type=Path,
+        default=pattern_generator.DEFAULT_ONTOLOGY,
+        help=f"Path to ontology file (default: {pattern_generator.DEFAULT_ONTOLOGY.name})"
+    )
+    common.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Report loading, caching and per-category progress on stderr"
+    )
+
+    # Options for pattern generation
+    patterns_opts = argparse.ArgumentParser(add_help=False)
+    pattern_generator.add_pattern_arguments(patterns_opts)
+
+    parser = argparse.ArgumentParser(
+        description="Run Catholic Semantic Canon ontology tools on a single loaded graph"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser(
+        "patterns", parents=[common, patterns_opts],
+        help="Generate regex patterns and VALUES clauses (pattern_generator.py)"
+    )
+    subparsers.add_parser(
+        "ambiguous", parents=[common],
+        help="Scan for ambiguous labels (find_ambiguous_terms.py)"
+    )
+    subparsers.add_parser(
+        "all", parents=[common, patterns_opts],
+        help="Run every tool against one loaded graph"
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+
+    # Validate inputs
+    if not args.ontology.exists():
+        logging.error(f"Error: Ontology file not found: {args.ontology}")
+        sys.exit(1)
+
+    if args.command == "patterns":
+        run_patterns(args)
+        return
+
+    graph = pattern_generator.load_ontology(args.ontology)
+    if args.command == "all":
+        run_patterns(args, graph)
+    find_ambiguous_terms.report_ambiguous_terms(graph)
+
+
+if __name__ == "__main__":
+    main()
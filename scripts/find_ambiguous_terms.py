@@ -15,12 +15,19 @@ Output:
 
 import sys
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 from rdflib import BNode, Graph, Namespace, RDF, RDFS, OWL
 from rdflib.exceptions import ParserError
 from rdflib.namespace import SKOS
 
+try:
+    # Optional: vectorized label normalization and grouping
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
 # Ontology namespace
 OSC = Namespace("https://ontology.catholicos.catholic/")
 
@@ -39,28 +46,48 @@ def load_ontology():
     return g
 
 
-def _process_label(g, class_uri, label_predicate, label_to_classes, is_alt=False):
-    """Helper to process labels for a given predicate."""
-    for label in g.objects(class_uri, label_predicate):
-        label_str = str(label).lower().strip()
+def _index_objects(g, predicate):
+    """Map each subject to its objects for one predicate in a single pass."""
+    index = defaultdict(list)
+    for subj, _, obj in g.triples((None, predicate, None)):
+        index[subj].append(obj)
+    return index
+
+
+def _parent_labels(class_uri, parents_by_subject, labels_by_subject):
+    """Get the labels of a class's named parent classes for context."""
+    parent_labels = []
+    for parent in parents_by_subject.get(class_uri, ()):
+        # Skip blank nodes (restrictions, unions, etc.) and owl:Thing
+        if isinstance(parent, BNode) or parent == OWL.Thing:
+            continue
+        parent_labels.extend(str(label) for label in labels_by_subject.get(parent, ()))
+    return parent_labels
+
 
-        # Get parent classes for context
-        parents = []
-        for parent in g.objects(class_uri, RDFS.subClassOf):
-            # Skip blank nodes (restrictions, unions, etc.) and owl:Thing
-            if isinstance(parent, BNode) or parent == OWL.Thing:
-                continue
-            for parent_label in g.objects(parent, RDFS.label):
-                parents.append(str(parent_label))
+def group_shared_labels(labels):
+    """
+    Group label positions by normalized (lowercased, trimmed) label.
 
-        entry = {
-            'uri': str(class_uri),
-            'label': str(label),
-            'parents': parents
-        }
-        if is_alt:
-            entry['is_alt'] = True
-        label_to_classes[label_str].append(entry)
+    Returns a dict mapping normalized label -> list of indices into labels,
+    only for normalized labels that occur more than once. Uses Arrow compute
+    kernels when pyarrow is installed.
+    """
+    if pa is not None:
+        keys = pc.utf8_lower(pc.utf8_trim_whitespace(pa.array(labels, type=pa.string())))
+        table = pa.table({'key': keys, 'row': pa.array(range(len(labels)), type=pa.int64())})
+        grouped = table.group_by('key', use_threads=False).aggregate([('row', 'list')])
+        grouped = grouped.filter(pc.greater(pc.list_value_length(grouped.column('row_list')), 1))
+        return dict(zip(grouped.column('key').to_pylist(), grouped.column('row_list').to_pylist()))
+
+    # Count first, then only collect rows for labels that are shared
+    keys = [label.lower().strip() for label in labels]
+    counts = Counter(keys)
+    groups = defaultdict(list)
+    for row, key in enumerate(keys):
+        if counts[key] > 1:
+            groups[key].append(row)
+    return groups
 
 
 def find_ambiguous_labels(g):
@@ -73,27 +100,45 @@ def find_ambiguous_labels(g):
         'parents': list of parent label strings
         'is_alt': True if from skos:altLabel (optional)
     """
-    # Collect all labels for each class
-    label_to_classes = defaultdict(list)
+    # Index labels and parents once instead of probing the graph per class
+    labels_by_subject = _index_objects(g, RDFS.label)
+    altlabels_by_subject = _index_objects(g, SKOS.altLabel)
+    parents_by_subject = _index_objects(g, RDFS.subClassOf)
+
+    # Collect (class, label, is_alt) rows for every class
+    rows = []
+    osc_prefix = str(OSC)
 
     for class_uri in g.subjects(RDF.type, OWL.Class):
         # Skip blank nodes
         if isinstance(class_uri, BNode):
             continue
         # Only consider our ontology namespace
-        if not str(class_uri).startswith(str(OSC)):
+        if not class_uri.startswith(osc_prefix):
             continue
 
         # Get rdfs:label and skos:altLabel
-        _process_label(g, class_uri, RDFS.label, label_to_classes)
-        _process_label(g, class_uri, SKOS.altLabel, label_to_classes, is_alt=True)
-
-    # Filter to only labels that appear on multiple classes
-    ambiguous = {
-        label: classes
-        for label, classes in label_to_classes.items()
-        if len(classes) > 1
-    }
+        rows.extend((class_uri, label, False) for label in labels_by_subject.get(class_uri, ()))
+        rows.extend((class_uri, label, True) for label in altlabels_by_subject.get(class_uri, ()))
+
+    # Build full entries only for labels that appear on multiple classes
+    ambiguous = {}
+    parents_by_class = {}
+    for label_str, row_ids in group_shared_labels([str(label) for _, label, _ in rows]).items():
+        entries = []
+        for row in row_ids:
+            class_uri, label, is_alt = rows[row]
+            if class_uri not in parents_by_class:
+                parents_by_class[class_uri] = _parent_labels(class_uri, parents_by_subject, labels_by_subject)
+            entry = {
+                'uri': str(class_uri),
+                'label': str(label),
+                'parents': parents_by_class[class_uri]
+            }
+            if is_alt:
+                entry['is_alt'] = True
+            entries.append(entry)
+        ambiguous[label_str] = entries
 
     return ambiguous
 
@@ -135,11 +180,24 @@ def generate_values_clause(ambiguous):
         for cls in classes:
             uris.add(cls['uri'])
 
-    print("VALUES ?class {")
-    for uri in sorted(uris):
-        uri_short = uri.replace(str(OSC), 'osc:')
-        print(f"  {uri_short}")
-    print("}")
+    # Build the clause as one string and write it once
+    lines = ["VALUES ?class {"]
+    lines.extend(f"  {uri.replace(str(OSC), 'osc:')}" for uri in sorted(uris))
+    lines.append("}")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def report_ambiguous_terms(g):
+    """Scan a loaded graph and print ambiguous labels with a VALUES clause."""
+    print("\nScanning for ambiguous labels...")
+    ambiguous = find_ambiguous_labels(g)
+
+    print_ambiguous_terms(ambiguous)
+    generate_values_clause(ambiguous)
+
+    if ambiguous:
+        print("\nNote: Review these terms to determine if they need")
+        print("disambiguation in queries/rdflib/07-disambiguation.rq")
 
 
 def main():
@@ -154,15 +212,7 @@ def main():
         print(f"Error loading ontology: {e}")
         sys.exit(1)
 
-    print("\nScanning for ambiguous labels...")
-    ambiguous = find_ambiguous_labels(g)
-
-    print_ambiguous_terms(ambiguous)
-    generate_values_clause(ambiguous)
-
-    if ambiguous:
-        print("\nNote: Review these terms to determine if they need")
-        print("disambiguation in queries/rdflib/07-disambiguation.rq")
+    report_ambiguous_terms(g)
 
 
 if __name__ == "__main__":
@@ -10,14 +10,33 @@ Usage:
     python pattern_generator.py                          # Use defaults
     python pattern_generator.py --config config.yaml     # Custom config
     python pattern_generator.py --output patterns.json   # Custom output
+    python pattern_generator.py --no-cache               # Ignore subclass cache
+    python pattern_generator.py --jobs 4                 # Parallel categories
+    python pattern_generator.py --build-ac               # Also write Aho-Corasick automata
+    python pattern_generator.py --build-hs               # Also write Hyperscan databases
+    python pattern_generator.py --ignore-case            # Case-insensitive labels and regex
+    python pattern_generator.py --strict-subclass-path   # Full rdfs:subClassOf closure
+    python pattern_generator.py --verbose                # Report progress on stderr
+
+Each category's "labels" list is its complete set of literal terms. Since the
+regex only matches those literals, "engine_hint" recommends a multi-literal
+matcher (Aho-Corasick, Hyperscan) over the regex for scanning large texts.
 """
 
 import argparse
+import functools
+import hashlib
 import json
+import logging
+import os
+import pickle
 import re
+import shutil
 import sys
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from urllib.parse import urljoin
 
 try:
     import yaml
@@ -26,13 +45,57 @@ except ImportError:
     print("Warning: PyYAML not installed. Install with: pip install pyyaml")
 
 try:
-    from rdflib import Graph, Namespace, URIRef
+    from rdflib import BNode, Graph, Literal, Namespace, URIRef
+    from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
     from rdflib.namespace import RDF, RDFS, OWL, SKOS
 except ImportError:
     print("Error: rdflib is not installed.")
     print("Install with: pip install rdflib")
     sys.exit(1)
 
+try:
+    # Optional: faster JSON serialization
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: precompiled multi-pattern matching databases
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    # Optional: linear-time regex engine, opt-in via compile_pattern(engine="re2")
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    # Optional: Aho-Corasick automata for literal label matching
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    # Registers the "Oxigraph" rdflib store plugin
+    import oxrdflib
+except ImportError:
+    oxrdflib = None
+
+try:
+    # Optional: columnar Arrow cache instead of pickle
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:
+    pa = None
+
+try:
+    # Optional: fast RDF/XML parsing straight into the ontology indices
+    from lxml import etree
+except ImportError:
+    etree = None
+
 
 # Paths relative to this script
 SCRIPT_DIR = Path(__file__).parent
@@ -45,49 +108,194 @@ DEFAULT_ONTOLOGY = SOURCES_DIR / "ontology-semantic-canon.owl"
 DEFAULT_CONFIG = CONFIG_DIR / "query-categories.yaml"
 DEFAULT_OUTPUT = GENERATED_DIR / "patterns.json"
 
+log = logging.getLogger(__name__)
+
 # Ontology namespace
 OSC = Namespace("https://ontology.catholicos.catholic/")
 
+# rdflib parser names by ontology file extension
+FORMAT_MAP = {
+    ".ttl": "turtle",
+    ".owl": "xml",
+    ".owx": "xml",
+    ".rdf": "xml",
+    ".n3": "n3",
+    ".nt": "nt",
+}
+
+
+def load_oxigraph_store(ontology_path: Path) -> Graph:
+    """Open the ontology from a persistent Oxigraph store, building it if stale."""
+    store_path = ontology_path.with_suffix(".oxigraph")
+    stamp_path = store_path / "source-mtime"
+    mtime = str(ontology_path.stat().st_mtime_ns)
+
+    # Pin the store's default graph so triples survive reopening
+    g = Graph(store="Oxigraph", identifier=DATASET_DEFAULT_GRAPH_ID)
+    # The stamp is "<mtime> <triple count>"; counting an Oxigraph store scans it
+    stamp = stamp_path.read_text().split() if stamp_path.exists() else []
+    if stamp[:1] == [mtime]:
+        g.open(str(store_path))
+        count = int(stamp[1]) if len(stamp) > 1 else len(g)
+        log.info(f"Loaded {count} triples from store {store_path.name}.")
+        return g
+
+    # Missing or stale store: rebuild from the ontology file
+    shutil.rmtree(store_path, ignore_errors=True)
+    log.info(f"Building store {store_path.name}...")
+    g.open(str(store_path), create=True)
+    g.parse(str(ontology_path), format=FORMAT_MAP.get(ontology_path.suffix.lower(), "turtle"))
+    count = len(g)
+    stamp_path.write_text(f"{mtime} {count}")
+    log.info(f"Loaded {count} triples.")
+    return g
+
+
+# Term kinds in the Arrow cache's term dictionary
+TERM_URI, TERM_BNODE, TERM_LITERAL = 0, 1, 2
+
+
+def save_arrow_cache(g: Graph, ontology_path: Path) -> None:
+    """
+    Save the graph as dictionary-encoded Arrow tables.
+
+    Every distinct term is stored once in a terms table, and the triples are
+    three int32 columns of term ids. The triples table's metadata records the
+    ontology's file name, modification time and namespace bindings; the
+    cache files are named by stem, so the name tells apart formats of the
+    same ontology.
+    """
+    triples_path = ontology_path.with_suffix(".triples.feather")
+    terms_path = ontology_path.with_suffix(".terms.feather")
+    try:
+        log.info(f"Saving to cache {triples_path.name}...")
+        term_ids = {}
+        columns = ([], [], [])
+        for triple in g:
+            for column, term in zip(columns, triple):
+                column.append(term_ids.setdefault(term, len(term_ids)))
+
+        kinds, values, datatypes, langs = [], [], [], []
+        for term in term_ids:
+            if isinstance(term, Literal):
+                kinds.append(TERM_LITERAL)
+                datatypes.append(str(term.datatype) if term.datatype else None)
+                langs.append(term.language)
+            else:
+                kinds.append(TERM_BNODE if isinstance(term, BNode) else TERM_URI)
+                datatypes.append(None)
+                langs.append(None)
+            values.append(str(term))
+
+        terms = pa.table({
+            "kind": pa.array(kinds, pa.int8()),
+            "value": pa.array(values, pa.string()),
+            "datatype": pa.array(datatypes, pa.string()),
+            "lang": pa.array(langs, pa.string()),
+        })
+        triples = pa.table(
+            {name: pa.array(column, pa.int32()) for name, column in zip("spo", columns)},
+            metadata={
+                "source_name": ontology_path.name,
+                "source_mtime": str(ontology_path.stat().st_mtime_ns),
+                "namespaces": json.dumps({prefix: str(ns) for prefix, ns in g.namespaces()}),
+            },
+        )
+        feather.write_feather(terms, terms_path)
+        feather.write_feather(triples, triples_path)
+        log.info("Cache saved successfully.")
+    except Exception as e:
+        log.warning(f"Warning: Could not save cache: {e}")
+
+
+def load_arrow_cache(ontology_path: Path) -> Graph | None:
+    """Load the graph from the Arrow cache, or return None if missing or stale."""
+    triples_path = ontology_path.with_suffix(".triples.feather")
+    terms_path = ontology_path.with_suffix(".terms.feather")
+    if not (triples_path.exists() and terms_path.exists()):
+        return None
+
+    try:
+        log.info(f"Loading from cache {triples_path.name}...")
+        triples = feather.read_table(triples_path, memory_map=True)
+        metadata = triples.schema.metadata or {}
+        if (metadata.get(b"source_name") != ontology_path.name.encode()
+                or metadata.get(b"source_mtime") != str(ontology_path.stat().st_mtime_ns).encode()):
+            log.info("Cache is out of date, parsing ontology...")
+            return None
+
+        terms_table = feather.read_table(terms_path, memory_map=True)
+        terms = []
+        for kind, value, datatype, lang in zip(
+            *(terms_table.column(name).to_pylist() for name in ("kind", "value", "datatype", "lang"))
+        ):
+            if kind == TERM_LITERAL:
+                terms.append(Literal(value, lang=lang, datatype=datatype))
+            elif kind == TERM_BNODE:
+                terms.append(BNode(value))
+            else:
+                terms.append(URIRef(value))
+
+        g = Graph()
+        for prefix, namespace in json.loads(metadata.get(b"namespaces", b"{}")).items():
+            g.bind(prefix, namespace, override=True)
+        # Terms are well-formed by construction, so bypass Graph.addN's per-triple checks
+        g.store.addN(
+            (terms[s], terms[p], terms[o], g)
+            for s, p, o in zip(*(triples.column(name).to_pylist() for name in "spo"))
+        )
+        log.info(f"Loaded {triples.num_rows} triples from cache.")
+        return g
+    except (pa.ArrowException, OSError, ValueError, IndexError, KeyError) as e:
+        log.warning(f"Cache load failed ({e}), parsing ontology...")
+        return None
+
 
 def load_ontology(ontology_path: Path) -> Graph:
     """Load the ontology into an RDF graph."""
-    print(f"Loading ontology from {ontology_path.name}...")
+    log.info(f"Loading ontology from {ontology_path.name}...")
+
+    # Prefer a persistent Oxigraph store when oxrdflib is available
+    if oxrdflib is not None:
+        return load_oxigraph_store(ontology_path)
 
-    # Try pickle cache first
+    # Try the Arrow cache (or the pickle cache without pyarrow) first
     cache_path = ontology_path.with_suffix(".pickle")
-    if cache_path.exists():
+    if pa is not None:
+        g = load_arrow_cache(ontology_path)
+        if g is not None:
+            return g
+    elif cache_path.exists() and cache_path.stat().st_mtime_ns < ontology_path.stat().st_mtime_ns:
+        log.info(f"Cache {cache_path.name} is older than the ontology, parsing ontology...")
+    elif cache_path.exists():
         try:
-            import pickle
             with open(cache_path, "rb") as f:
-                g = pickle.load(f)
-            print(f"Loaded {len(g)} triples from cache.")
+                cached = pickle.load(f)
+            # Caches store (graph, triple count); older caches hold just the graph
+            g, count = cached if isinstance(cached, tuple) else (cached, len(cached))
+            log.info(f"Loaded {count} triples from cache.")
             return g
-        except (pickle.UnpicklingError, EOFError, AttributeError, ModuleNotFoundError, OSError) as e:
-            print(f"Cache load failed ({e}), parsing ontology...")
+        except Exception as e:
+            log.warning(f"Cache load failed ({e}), parsing ontology...")
 
     g = Graph()
-    suffix = ontology_path.suffix.lower()
-    format_map = {
-        ".ttl": "turtle",
-        ".owl": "xml",
-        ".owx": "xml",
-        ".rdf": "xml",
-        ".n3": "n3",
-        ".nt": "nt",
-    }
-    rdf_format = format_map.get(suffix, "turtle")
+    rdf_format = FORMAT_MAP.get(ontology_path.suffix.lower(), "turtle")
     g.parse(str(ontology_path), format=rdf_format)
-    print(f"Loaded {len(g)} triples.")
+    count = len(g)
+    log.info(f"Loaded {count} triples.")
 
     # Save to cache for faster subsequent loads
+    if pa is not None:
+        save_arrow_cache(g, ontology_path)
+        return g
+
     try:
-        import pickle
-        print(f"Saving to cache {cache_path.name}...")
+        log.info(f"Saving to cache {cache_path.name}...")
         with open(cache_path, "wb") as f:
-            pickle.dump(g, f)
-        print("Cache saved successfully.")
+            pickle.dump((g, count), f)
+        log.info("Cache saved successfully.")
     except Exception as e:
-        print(f"Warning: Could not save cache: {e}")
+        log.warning(f"Warning: Could not save cache: {e}")
 
     return g
 
@@ -95,11 +303,11 @@ def load_ontology(ontology_path: Path) -> Graph:
 def load_config(config_path: Path) -> dict:
     """Load the category configuration from YAML."""
     if not yaml:
-        print("Error: PyYAML required to load config. Using built-in defaults.")
+        log.warning("Error: PyYAML required to load config. Using built-in defaults.")
         return get_default_config()
 
     if not config_path.exists():
-        print(f"Config not found: {config_path}. Using built-in defaults.")
+        log.warning(f"Config not found: {config_path}. Using built-in defaults.")
         return get_default_config()
 
     with open(config_path) as f:
@@ -107,10 +315,10 @@ def load_config(config_path: Path) -> dict:
 
     # Validate structure
     if not isinstance(config, dict):
-        print("Warning: Invalid config structure, using defaults.")
+        log.warning("Warning: Invalid config structure, using defaults.")
         return get_default_config()
     if "categories" not in config or not isinstance(config["categories"], dict):
-        print("Warning: Config missing 'categories', using defaults.")
+        log.warning("Warning: Config missing 'categories', using defaults.")
         return get_default_config()
 
     return config
@@ -145,152 +353,531 @@ def get_default_config() -> dict:
     }
 
 
-def get_subclass_labels(graph: Graph, root_uri: URIRef) -> set:
-    """
-    Get all labels for classes that are subclasses of the given root class.
-    Uses UNION patterns to emulate rdfs:subClassOf* (avoids rdflib segfaults).
-
-    Security note: root_uri is interpolated into the SPARQL query string.
-    Only pass URIRef objects from trusted sources (e.g., config files).
-    """
-    # Validate URI format to prevent injection
-    uri_str = str(root_uri)
-    if not uri_str.startswith(("http://", "https://")) or any(c in uri_str for c in ['>', '<', '"', "'"]):
-        raise ValueError(f"Invalid URI format: {uri_str}")
-
-    # Use UNION patterns instead of rdfs:subClassOf* to avoid Python 3.12 segfaults
-    query = """
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    PREFIX owl: <http://www.w3.org/2002/07/owl#>
-    PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-
-    SELECT ?label
-    WHERE {
-      {
-        # Level 0: root class itself
-        BIND(<%s> AS ?class)
-      }
-      UNION
-      {
-        # Level 1: direct children
-        ?class rdfs:subClassOf <%s> .
-      }
-      UNION
-      {
-        # Level 2: grandchildren
-        ?parent rdfs:subClassOf <%s> .
-        ?class rdfs:subClassOf ?parent .
-      }
-      UNION
-      {
-        # Level 3: great-grandchildren
-        ?grandparent rdfs:subClassOf <%s> .
-        ?parent rdfs:subClassOf ?grandparent .
-        ?class rdfs:subClassOf ?parent .
-      }
-      ?class a owl:Class .
-      {
-        ?class rdfs:label ?label .
-      }
-      UNION
-      {
-        ?class skos:altLabel ?label .
-      }
-      UNION
-      {
-        ?class skos:prefLabel ?label .
-      }
+# URIs and labels in the indices are interned: the same class URI appears in
+# several indices and many labels recur across classes, so each distinct
+# string is stored (and pickled) once.
+
+def build_subclass_index(graph: Graph) -> dict:
+    """Map each class to its direct subclasses in one pass over rdfs:subClassOf."""
+    children = defaultdict(list)
+    for child, _, parent in graph.triples((None, RDFS.subClassOf, None)):
+        children[sys.intern(str(parent))].append(sys.intern(str(child)))
+    return dict(children)
+
+
+def build_label_index(graph: Graph) -> dict:
+    """Map each subject to its stripped rdfs:label, skos:altLabel and skos:prefLabel values."""
+    labels_by_subject = defaultdict(list)
+    for predicate in (RDFS.label, SKOS.altLabel, SKOS.prefLabel):
+        for subject, _, label in graph.triples((None, predicate, None)):
+            labels_by_subject[sys.intern(str(subject))].append(sys.intern(str(label).strip()))
+    return dict(labels_by_subject)
+
+
+def build_class_set(graph: Graph) -> set:
+    """Collect every subject typed owl:Class in one pass."""
+    return {sys.intern(str(cls)) for cls, _, _ in graph.triples((None, RDF.type, OWL.Class))}
+
+
+# RDF/XML names (lxml "{namespace}local" form) read by fast_parse_owl
+_XML_BASE = "{http://www.w3.org/XML/1998/namespace}base"
+_RDF_RDF = f"{{{RDF}}}RDF"
+_RDF_ABOUT = f"{{{RDF}}}about"
+_RDF_ID = f"{{{RDF}}}ID"
+_RDF_RESOURCE = f"{{{RDF}}}resource"
+_RDF_PARSE_TYPE = f"{{{RDF}}}parseType"
+_PARSE_TYPE_KINDS = {"Resource": "resource", "Literal": "literal"}
+_RDF_TYPE = f"{{{RDF}}}type"
+_OWL_CLASS = f"{{{OWL}}}Class"
+_OWL_CLASS_URI = str(OWL.Class)
+_RDFS_SUBCLASSOF = f"{{{RDFS}}}subClassOf"
+_LABEL_TAGS = (f"{{{RDFS}}}label", f"{{{SKOS}}}altLabel", f"{{{SKOS}}}prefLabel")
+
+
+def fast_parse_owl(ontology_path: Path) -> dict | None:
+    """
+    Build the ontology indices directly from an RDF/XML file with lxml.
+
+    Streams the node elements (owl:Class, rdf:Description, ...) and reads
+    only what the indices need: rdf:type, rdfs:subClassOf references and
+    label properties, resolving URIs against xml:base like rdflib does.
+    Named node elements nested in a property, such as
+    <rdfs:subClassOf><owl:Class rdf:about="..."/></rdfs:subClassOf>, are
+    indexed as subjects and as the object of that property. Blank node
+    descriptions such as owl:Restriction superclasses are skipped, as no
+    label index entry hangs off them. Returns the same structure as
+    build_indices, or None if the file is not RDF/XML (e.g. OWL/XML) or
+    uses a label form the fast path does not read, so the caller can fall
+    back to rdflib.
+    """
+    children = defaultdict(list)
+    labels_by_subject = defaultdict(list)
+    owl_classes = set()
+
+    # Given a path, libxml2 streams the file in small chunks itself; there is
+    # no whole-file buffer for mmap or a file object to save
+    context = etree.iterparse(str(ontology_path), events=("start", "end"))
+    _, root = next(context)
+    if root.tag != _RDF_RDF:
+        log.info(f"{ontology_path.name} is not RDF/XML, parsing with rdflib...")
+        return None
+
+    def resolve(uri: str, base: str) -> str:
+        return sys.intern(uri if ":" in uri else urljoin(base, uri))
+
+    def base_of(elem, parent_base: str) -> str:
+        xml_base = elem.get(_XML_BASE)
+        return parent_base if xml_base is None else urljoin(parent_base, xml_base)
+
+    def subject_of(elem, base: str) -> str | None:
+        about = elem.get(_RDF_ABOUT)
+        if about is not None:
+            return resolve(about, base)
+        if elem.get(_RDF_ID) is not None:
+            return sys.intern(urljoin(base, "#" + elem.get(_RDF_ID)))
+        return None
+
+    def add_object(subject: str, prop_tag: str, obj: str) -> None:
+        if prop_tag == _RDFS_SUBCLASSOF:
+            children[obj].append(subject)
+        elif prop_tag == _RDF_TYPE and obj == _OWL_CLASS_URI:
+            owl_classes.add(subject)
+
+    def add_property_attributes(subject: str, elem, base: str) -> None:
+        # Labels and rdf:type may be written as attributes of the element
+        for tag in _LABEL_TAGS:
+            label = elem.get(tag)
+            if label is not None:
+                labels_by_subject[subject].append(sys.intern(label.strip()))
+        rdf_type = elem.get(_RDF_TYPE)
+        if rdf_type is not None:
+            add_object(subject, _RDF_TYPE, resolve(rdf_type, base))
+
+    # RDF/XML alternates node and property elements, except that a
+    # parseType="Resource" property holds properties and a
+    # parseType="Literal" one holds opaque XML. Each open element's kind is
+    # stacked with its xml:base.
+    stack = [("property", base_of(root, ontology_path.absolute().as_uri()))]
+    for event, elem in context:
+        if event == "start":
+            parent_kind, parent_base = stack[-1]
+            if parent_kind == "literal":
+                kind = "literal"
+            elif parent_kind in ("node", "resource"):
+                kind = _PARSE_TYPE_KINDS.get(elem.get(_RDF_PARSE_TYPE), "property")
+            else:
+                kind = "node"
+            xml_base = elem.get(_XML_BASE)
+            stack.append((kind, parent_base if xml_base is None else urljoin(parent_base, xml_base)))
+            continue
+        kind, base = stack.pop()
+        if kind != "node":
+            continue
+
+        subject = subject_of(elem, base)
+        if subject is not None:
+            if elem.tag == _OWL_CLASS:
+                owl_classes.add(subject)
+            if len(elem.attrib) > 1:
+                add_property_attributes(subject, elem, base)
+            for prop in elem:
+                resource = prop.get(_RDF_RESOURCE)
+                if prop.tag in _LABEL_TAGS:
+                    # XML literals and resource-valued labels need rdflib
+                    if resource is not None or prop.get(_RDF_PARSE_TYPE) is not None or len(prop):
+                        log.info(f"{ontology_path.name} has a non-plain label on {subject}, "
+                                 "parsing with rdflib...")
+                        return None
+                    labels_by_subject[subject].append(sys.intern((prop.text or "").strip()))
+                elif resource is not None:
+                    prop_base = base_of(prop, base)
+                    obj = resolve(resource, prop_base)
+                    add_object(subject, prop.tag, obj)
+                    if len(prop.attrib) > 1:
+                        add_property_attributes(obj, prop, prop_base)
+
+            enclosing = elem.getparent()
+            if enclosing is not root and enclosing.get(_RDF_PARSE_TYPE) is None:
+                outer = subject_of(enclosing.getparent(), stack[-2][1])
+                if outer is not None:
+                    add_object(outer, enclosing.tag, subject)
+
+        # Drop processed top-level elements to keep memory flat; nested ones
+        # go with their top-level ancestor
+        if elem.getparent() is root:
+            elem.clear()
+            while elem.getprevious() is not None:
+                del root[0]
+
+    return {
+        "children": dict(children),
+        "labels": dict(labels_by_subject),
+        "classes": owl_classes,
     }
-    """ % (uri_str, uri_str, uri_str, uri_str)
 
-    labels = set()
-    try:
-        for row in graph.query(query):
-            if row.label:
-                label_str = str(row.label)
-                # Clean up the label
-                label_str = label_str.strip()
-                if label_str and len(label_str) > 1:
-                    labels.add(label_str)
-    except (TypeError, ValueError, AttributeError, KeyError) as e:
-        print(f"  Warning: Query failed for {root_uri}: {e}")
-
-    return labels
-
-
-def get_subclass_uris(graph: Graph, root_uri: URIRef) -> list:
-    """
-    Get all URIs for classes that are subclasses of the given root class.
-    Uses UNION patterns to emulate rdfs:subClassOf* (avoids rdflib segfaults).
-
-    Security note: root_uri is interpolated into the SPARQL query string.
-    Only pass URIRef objects from trusted sources (e.g., config files).
-    """
-    # Validate URI format to prevent injection
-    uri_str = str(root_uri)
-    if not uri_str.startswith(("http://", "https://")) or any(c in uri_str for c in ['>', '<', '"', "'"]):
-        raise ValueError(f"Invalid URI format: {uri_str}")
-
-    # Use UNION patterns instead of rdfs:subClassOf* to avoid Python 3.12 segfaults
-    query = """
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    PREFIX owl: <http://www.w3.org/2002/07/owl#>
-
-    SELECT ?class
-    WHERE {
-      {
-        # Level 0: root class itself
-        BIND(<%s> AS ?class)
-      }
-      UNION
-      {
-        # Level 1: direct children
-        ?class rdfs:subClassOf <%s> .
-      }
-      UNION
-      {
-        # Level 2: grandchildren
-        ?parent rdfs:subClassOf <%s> .
-        ?class rdfs:subClassOf ?parent .
-      }
-      UNION
-      {
-        # Level 3: great-grandchildren
-        ?grandparent rdfs:subClassOf <%s> .
-        ?parent rdfs:subClassOf ?grandparent .
-        ?class rdfs:subClassOf ?parent .
-      }
-      ?class a owl:Class .
+
+def build_indices(graph: Graph) -> dict:
+    """
+    Build the subclass, label and class indices used for pattern generation.
+
+    Keys and values are plain strings rather than rdflib terms, so the
+    indices pickle compactly and load without rdflib's term reconstruction.
+    """
+    return {
+        "children": build_subclass_index(graph),
+        "labels": build_label_index(graph),
+        "classes": build_class_set(graph),
     }
-    """ % (uri_str, uri_str, uri_str, uri_str)
 
-    uris = set()
+
+def load_or_build_indices(ontology_path: Path) -> dict:
+    """
+    Load the ontology indices from the .idx.pickle cache, or build them.
+
+    The cache is much smaller and faster to load than the full graph. It is
+    named after the full ontology file name, so each source format gets its
+    own, and records the file's name, size and modification time under
+    "source"; it is rebuilt when missing, unreadable or recorded for another
+    file. It is written atomically so an interrupted run never leaves a
+    truncated cache behind. Index sizes are stored in the cache under
+    "counts" for reporting.
+    """
+    cache_path = ontology_path.with_name(ontology_path.name + ".idx.pickle")
+    stat = ontology_path.stat()
+    source = {"name": ontology_path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if cache_path.exists():
+        try:
+            with open(cache_path, "rb") as f:
+                indices = pickle.load(f)
+            if indices["source"] == source:
+                counts = indices["counts"]
+                log.info(f"Loaded indices of {counts['classes']} classes and "
+                         f"{counts['labelled']} labelled subjects from {cache_path.name}.")
+                return indices
+            log.info(f"Index cache {cache_path.name} is out of date, rebuilding...")
+        except (pickle.UnpicklingError, EOFError, AttributeError, ModuleNotFoundError,
+                OSError, KeyError, TypeError) as e:
+            log.warning(f"Index cache load failed ({e}), rebuilding...")
+
+    if etree is not None and FORMAT_MAP.get(ontology_path.suffix.lower()) == "xml":
+        log.info(f"Parsing {ontology_path.name} with lxml...")
+        indices = fast_parse_owl(ontology_path)
+    else:
+        indices = None
+    if indices is None:
+        indices = build_indices(load_ontology(ontology_path))
+    indices["source"] = source
+    indices["counts"] = {
+        "parents": len(indices["children"]),
+        "labelled": len(indices["labels"]),
+        "classes": len(indices["classes"]),
+    }
+    log.info(f"Indexed {indices['counts']['classes']} classes and "
+             f"{indices['counts']['labelled']} labelled subjects.")
+
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
     try:
-        for row in graph.query(query):
-            if row["class"]:
-                uris.add(str(row["class"]))
-    except (TypeError, ValueError, AttributeError, KeyError) as e:
-        print(f"  Warning: Query failed for {root_uri}: {e}")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(indices, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log.warning(f"Warning: Could not save index cache: {e}")
+
+    return indices
+
+
+def color_subclasses(children: dict, root_uris: list, owl_classes: set = None) -> dict:
+    """
+    Map every class reachable from the given roots to a bitmask of those roots.
+
+    Bit i is set when the class is root_uris[i] or one of its transitive
+    subclasses. A single breadth-first pass covers all roots at once: a class
+    is only revisited when it gains a new root bit, so subtrees shared between
+    roots are not walked once per root. If owl_classes is given, only
+    subclasses that are owl:Class are followed, so the walk never enters
+    non-class regions of the hierarchy.
+    """
+    color = {}
+    for i, root_uri in enumerate(root_uris):
+        color[root_uri] = color.get(root_uri, 0) | 1 << i
+
+    queue = deque(color)
+    while queue:
+        cls = queue.popleft()
+        bits = color[cls]
+        for child in children.get(cls, ()):
+            if owl_classes is not None and child not in owl_classes:
+                continue
+            child_bits = color.get(child, 0)
+            if child_bits | bits != child_bits:
+                color[child] = child_bits | bits
+                queue.append(child)
+    return color
+
+
+def collect_subclasses(indices: dict, root_uris: list, strict: bool = False) -> dict:
+    """
+    Collect the labels and URIs of the owl:Class subclasses of each root.
+
+    By default subclass paths are only followed through owl:Class nodes;
+    with strict, the full rdfs:subClassOf closure is walked, including
+    paths through nodes that are not owl:Class.
+
+    Returns {root_uri: {"labels": [...], "uris": [...]}} with sorted lists,
+    the same shape as the entries of the subclass cache.
+    """
+    owl_classes = indices["classes"]
+    labels_by_subject = indices["labels"]
+    labels = [set() for _ in root_uris]
+    uris = [[] for _ in root_uris]
+
+    colors = color_subclasses(indices["children"], root_uris, None if strict else owl_classes)
+    for cls, bits in colors.items():
+        if cls not in owl_classes:
+            continue
+        cls_labels = [label for label in labels_by_subject.get(cls, ()) if len(label) > 1]
+        i = 0
+        while bits:
+            if bits & 1:
+                labels[i].update(cls_labels)
+                uris[i].append(cls)
+            bits >>= 1
+            i += 1
+
+    return {
+        root_uri: {"labels": sorted(labels[i]), "uris": sorted(uris[i])}
+        for i, root_uri in enumerate(root_uris)
+    }
+
+
+def _build_trie(labels) -> dict:
+    """
+    Build a character trie of the labels; the "" key marks the end of a label.
+
+    Edges are keyed by the regex-escaped character, escaping each distinct
+    character once rather than once per trie edge.
+    """
+    escaped = {}
+    root = {}
+    for label in labels:
+        node = root
+        for char in label:
+            key = escaped.get(char)
+            if key is None:
+                key = escaped[char] = re.escape(char)
+            node = node.setdefault(key, {})
+        node[""] = {}
+    return root
+
+
+def _trie_to_regex(node: dict, out: list) -> None:
+    """
+    Append the regex for a trie node to out, factoring shared prefixes into groups.
+
+    Chains of single-child nodes are emitted inline, and a lone one-character
+    ending is emitted as "x?" rather than a group. A node that ends a label
+    makes its continuations optional. The optional group is greedy, so the
+    longest label still wins (e.g. "Bishop Emeritus" over "Bishop"), as with
+    a longest-first alternation.
+    """
+    while len(node) == 1 and "" not in node:
+        ((char, node),) = node.items()
+        out.append(char)
+
+    branches = sorted(char for char in node if char)
+    if not branches:
+        return
+    # A single escaped character ending a label: "x?" instead of "(?:x)?"
+    only = branches[0]
+    if "" in node and len(branches) == 1 and node[only] == {"": {}} and len(only.lstrip("\\")) == 1:
+        out.append(only + "?")
+        return
+
+    out.append("(?:")
+    for i, char in enumerate(branches):
+        if i:
+            out.append("|")
+        out.append(char)
+        _trie_to_regex(node[char], out)
+    out.append(")?" if "" in node else ")")
+
+
+def fold_labels(labels) -> list:
+    """
+    Deduplicate labels case-insensitively, sorted by their case-folded form.
 
-    return list(uris)
+    Of labels differing only in case, an all-caps variant is kept only if
+    there is no other, and otherwise the first in sorted order, so the
+    capitalised form wins (e.g. "Bishop" over "BISHOP" and "bishop").
+    """
+    folded = {}
+    for label in sorted(labels, key=lambda label: (label.isupper(), label)):
+        folded.setdefault(label.casefold(), label)
+    return [folded[key] for key in sorted(folded)]
 
 
-def generate_regex_pattern(labels: set) -> str:
-    """Generate a regex pattern from a set of labels."""
+def generate_regex_pattern(labels: set, ignore_case: bool = False) -> str:
+    """
+    Generate a regex pattern from a set of labels.
+
+    The labels are compiled into a prefix trie, so labels sharing a prefix
+    (e.g. "Bishop", "Bishop Emeritus", "Bishop of Rome") share one branch
+    instead of being tried one alternative at a time. With ignore_case the
+    pattern starts with the (?i) flag and the trie is built over lowercased
+    labels, so case variants ("Bishop", "bishop emeritus") share a branch
+    and the longest label still wins.
+    """
     if not labels:
         return ""
 
-    # Escape special regex characters and join with |
-    escaped = [re.escape(label) for label in sorted(labels)]
-    # Add word boundaries for whole-word matching
-    pattern = "|".join(escaped)
-    return rf"\b(?:{pattern})\b"
+    if ignore_case:
+        labels = {label.lower() for label in labels}
+
+    # Word boundaries for whole-word matching
+    out = ["(?i)" if ignore_case else "", r"\b"]
+    _trie_to_regex(_build_trie(labels), out)
+    out.append(r"\b")
+    return "".join(out)
+
+
+# Memory budget for an RE2 program; the default 8 MB DFA budget is exhausted
+# by the larger category patterns
+RE2_MAX_MEM = 256 << 20
+
+
+@functools.lru_cache(maxsize=None)
+def compile_pattern(pattern: str, engine: str = "re"):
+    """
+    Compile a generated regex pattern once per process.
+
+    Uses the re module by default, which is fastest on the generated
+    trie patterns. engine="re2" opts into RE2 (linear-time matching
+    guarantee) and requires google-re2. Note that RE2's word boundaries
+    are ASCII-only, so under RE2 a label that starts or ends with a
+    non-ASCII letter (e.g. "École") never matches, and a label next to
+    one (e.g. "Mass" in "Massé") can match where re would not.
+    """
+    if engine == "re":
+        return re.compile(pattern)
+    if engine != "re2":
+        raise ValueError(f"Unknown regex engine: {engine}")
+    if re2 is None:
+        raise ImportError("engine='re2' requires google-re2: pip install google-re2")
+    options = re2.Options()
+    options.max_mem = RE2_MAX_MEM
+    return re2.compile(pattern, options)
+
+
+def load_compiled_patterns(patterns_path: Path, engine: str = "re") -> dict:
+    """Load a generated patterns file and compile each category's regex once."""
+    with open(patterns_path, encoding="utf-8") as f:
+        patterns = json.load(f)
+    return {
+        cat_name: compile_pattern(cat_data["regex"], engine)
+        for cat_name, cat_data in patterns["categories"].items()
+        if cat_data.get("regex")
+    }
+
+
+# Characters that end a word for Hyperscan: ASCII non-word characters plus
+# common Unicode spaces, quotes and dashes. Unicode \W is too large for
+# Hyperscan to compile per label in reasonable time.
+_HS_BOUNDARY = (
+    r"[\x00-\x2f\x3a-\x40\x5b-\x5e\x60\x7b-\x7f"
+    r"\x{a0}\x{ab}\x{bb}\x{2000}-\x{206f}\x{3000}]"
+)
+
+
+def generate_hyperscan_db(labels: list) -> bytes:
+    """
+    Compile labels into a serialized Hyperscan database.
+
+    Each label is a separate whole-word, case-insensitive expression whose
+    match id is its index in labels; pass the category's "labels" list so
+    ids index into it. Non-ASCII letters count as word characters, as with
+    re: Hyperscan has no word boundaries in Unicode (UCP) mode, so each is
+    guarded by _HS_BOUNDARY or the start/end of the text, and a match's
+    offsets include the guard character when there is one. To scan, load it
+    and attach scratch space first:
+
+        db = hyperscan.loadb(data, hyperscan.HS_MODE_BLOCK)
+        db.scratch = hyperscan.Scratch(db)
+        db.scan(text.encode("utf-8"), match_event_handler=on_match)
+    """
+    flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+             | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[
+            f"(?:^|{_HS_BOUNDARY}){re.escape(label)}(?:{_HS_BOUNDARY}|$)".encode("utf-8")
+            for label in labels
+        ],
+        ids=list(range(len(labels))),
+        flags=[flags] * len(labels),
+    )
+    return hyperscan.dumpb(db)
+
+
+def write_hyperscan_dbs(patterns: dict, output_path: Path) -> None:
+    """Write a Hyperscan database per category next to the output file."""
+    for cat_name, cat_data in patterns["categories"].items():
+        if not cat_data["labels"]:
+            continue
+        db_path = output_path.with_name(f"{output_path.stem}.{cat_name}.hs")
+        try:
+            db_path.write_bytes(generate_hyperscan_db(cat_data["labels"]))
+        except (hyperscan.error, OSError) as e:
+            log.warning(f"Warning: Could not write Hyperscan database for {cat_name}: {e}")
+            continue
+        cat_data["hyperscan_db"] = db_path.name
+
+
+def generate_aho_corasick(labels: list):
+    """
+    Build an Aho-Corasick automaton over the lowercased labels.
+
+    Matches all labels in a single linear pass over the input text. Each
+    word's value is (index, label), where index is the label's position in
+    labels; pass the category's "labels" list so indices point into it.
+    """
+    automaton = ahocorasick.Automaton()
+    for i, label in enumerate(labels):
+        automaton.add_word(label.lower(), (i, label))
+    automaton.make_automaton()
+    return automaton
+
 
+def write_aho_corasick_automata(patterns: dict, output_path: Path) -> None:
+    """
+    Write an Aho-Corasick automaton per category next to the output file.
 
-def generate_values_clause(uris: list) -> str:
+    Load with ahocorasick.load(path, pickle.loads).
+    """
+    for cat_name, cat_data in patterns["categories"].items():
+        if not cat_data["labels"]:
+            continue
+        ac_path = output_path.with_name(f"{output_path.stem}.{cat_name}.ac")
+        try:
+            generate_aho_corasick(cat_data["labels"]).save(str(ac_path), pickle.dumps)
+        except OSError as e:
+            log.warning(f"Warning: Could not write Aho-Corasick automaton for {cat_name}: {e}")
+            continue
+        cat_data["aho_corasick"] = ac_path.name
+
+
+# Local names that can be written as a prefixed name (osc:Rxxxx) as is
+_SIMPLE_LOCAL_NAME = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_-]*")
+
+
+def generate_values_clause(uris: list, namespace: str = None) -> str:
     """
     Generate a SPARQL VALUES clause from a list of URIs.
 
+    If namespace is given and every URI is a simple local name in it, the
+    clause uses osc: prefixed names preceded by the matching PREFIX
+    declaration, which is much shorter than full URIs. Otherwise full URIs
+    are written.
+
     Note: Large ontologies (hundreds/thousands of classes) may generate
     VALUES clauses exceeding SPARQL endpoint query limits (often 2KB-10KB).
     Currently acceptable for the Catholic Semantic Canon ontology size.
@@ -298,14 +885,164 @@ def generate_values_clause(uris: list) -> str:
     if not uris:
         return "VALUES ?targetClass { }"
 
+    if namespace:
+        local_names = [uri[len(namespace):] for uri in sorted(uris) if uri.startswith(namespace)]
+        if len(local_names) == len(uris) and all(map(_SIMPLE_LOCAL_NAME.fullmatch, local_names)):
+            formatted = " ".join(f"osc:{name}" for name in local_names)
+            return f"PREFIX osc: <{namespace}>\nVALUES ?targetClass {{ {formatted} }}"
+
     formatted = " ".join(f"<{uri}>" for uri in sorted(uris))
     return f"VALUES ?targetClass {{ {formatted} }}"
 
 
-def generate_patterns(ontology_path: Path, config: dict) -> dict:
-    """Generate patterns for all categories defined in the config."""
-    graph = load_ontology(ontology_path)
+def ontology_hash(ontology_path: Path) -> str:
+    """Short content hash identifying a version of the ontology file."""
+    return hashlib.sha256(ontology_path.read_bytes()).hexdigest()[:16]
+
+
+def load_subclass_cache(cache_path: Path, ontology_sha256: str, strict: bool) -> dict:
+    """
+    Load cached per-root subclass results from a JSON sidecar.
+
+    Returns an empty dict if the sidecar is missing, unreadable, or was
+    written for a different version of the ontology file or a different
+    subclass path mode. Versions are told apart by content hash, so a fresh
+    checkout or a touched file with the same content still hits the cache.
+    """
+    if not cache_path.exists():
+        return {}
+    try:
+        with open(cache_path) as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        log.warning(f"Warning: Ignoring subclass cache ({e})")
+        return {}
+    if not isinstance(data, dict) or data.get("ontology_sha256") != ontology_sha256:
+        return {}
+    if data.get("strict_subclass_path", False) != strict:
+        return {}
+    return data.get("roots", {})
+
+
+def save_subclass_cache(cache_path: Path, ontology_sha256: str, strict: bool, roots: dict) -> None:
+    """Persist per-root subclass results, stamped with the ontology content hash."""
+    data = {
+        "ontology_sha256": ontology_sha256,
+        "strict_subclass_path": strict,
+        "roots": roots,
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(data, f, ensure_ascii=False)
+    except OSError as e:
+        log.warning(f"Warning: Could not save subclass cache: {e}")
+
+
+# Subclass results for process_category, set by init_category_worker
+_worker_state = {}
+
+
+def init_category_worker(subclass_cache: dict, namespace: str, ignore_case: bool) -> None:
+    """Install the shared subclass results in this (worker) process."""
+    _worker_state.update(
+        subclass_cache=subclass_cache,
+        namespace=namespace,
+        ignore_case=ignore_case,
+    )
+
+
+def process_category(item: tuple) -> tuple:
+    """
+    Build the patterns for one (cat_name, cat_config) item.
+
+    Returns (cat_name, category patterns, progress lines) so the caller can
+    print in order.
+    """
+    cat_name, cat_config = item
+    subclass_cache = _worker_state["subclass_cache"]
+    namespace = _worker_state["namespace"]
+    ignore_case = _worker_state["ignore_case"]
+
+    cat_labels = set()
+    cat_uris = set()
+    progress = []
+
+    root_classes = cat_config.get("root_classes", [])
+    for root in root_classes:
+        root_id = root.get("id", "")
+        root_label = root.get("label", "")
+        root_uri = f"{namespace}{root_id}"
+
+        progress.append(f"  Root class: {root_label} ({root_id})")
+
+        cached = subclass_cache[root_uri]
+
+        # Get labels from subclasses
+        labels = cached["labels"]
+        cat_labels.update(labels)
+        progress.append(f"    Found {len(labels)} labels")
+
+        # Get URIs from subclasses
+        uris = cached["uris"]
+        cat_uris.update(uris)
+        progress.append(f"    Found {len(uris)} classes")
+
+    # Generate patterns
+    sorted_labels = fold_labels(cat_labels) if ignore_case else sorted(cat_labels)
+    sorted_uris = sorted(cat_uris)
+    cat_patterns = {
+        "label": cat_config.get("label", cat_name),
+        "description": cat_config.get("description", ""),
+        "labels": sorted_labels,
+        "label_count": len(sorted_labels),
+        "engine_hint": "aho-corasick",
+        "regex": generate_regex_pattern(sorted_labels, ignore_case),
+        "class_uris": sorted_uris,
+        "class_count": len(sorted_uris),
+        "values_clause": generate_values_clause(sorted_uris),
+        "values_clause_prefixed": generate_values_clause(sorted_uris, namespace),
+    }
+
+    return cat_name, cat_patterns, progress
+
+
+def generate_patterns(ontology_path: Path, config: dict, cache_path: Path = None,
+                      jobs: int = 1, graph: Graph = None,
+                      ignore_case: bool = False, strict_subclass_path: bool = False) -> dict:
+    """
+    Generate patterns for all categories defined in the config.
+
+    The subclasses of every root class are collected in one multi-source
+    traversal; categories are then built in this process by default, or
+    in parallel across up to `jobs` worker processes, never more than
+    there are categories. Worker startup outweighs the per-category work
+    for small configs, so only ask for jobs on large ones. If
+    cache_path is given, subclass results are reused across runs and the
+    ontology indices are only loaded on a cache miss. A graph already loaded
+    from ontology_path may be passed to build them from on that miss instead.
+    With ignore_case, labels are deduplicated case-insensitively and the
+    regexes match case-insensitively. With strict_subclass_path, subclasses
+    reached only through non-owl:Class nodes are included as well.
+    """
     namespace = config.get("namespace", "https://ontology.catholicos.catholic/")
+    categories = config.get("categories", {})
+
+    ontology_sha256 = ontology_hash(ontology_path) if cache_path else None
+    subclass_cache = (
+        load_subclass_cache(cache_path, ontology_sha256, strict_subclass_path) if cache_path else {}
+    )
+
+    # Only load the ontology if some root class is not cached
+    root_uris = dict.fromkeys(
+        f"{namespace}{root.get('id', '')}"
+        for cat_config in categories.values()
+        for root in cat_config.get("root_classes", [])
+    )
+    missing = [root_uri for root_uri in root_uris if root_uri not in subclass_cache]
+    if missing:
+        indices = build_indices(graph) if graph is not None else load_or_build_indices(ontology_path)
+        subclass_cache.update(collect_subclasses(indices, missing, strict_subclass_path))
 
     patterns = {
         "metadata": {
@@ -316,56 +1053,70 @@ def generate_patterns(ontology_path: Path, config: dict) -> dict:
         "categories": {}
     }
 
-    categories = config.get("categories", {})
-
-    for cat_name, cat_config in categories.items():
-        print(f"\nProcessing category: {cat_name}")
-        cat_labels = set()
-        cat_uris = []
-
-        root_classes = cat_config.get("root_classes", [])
-        for root in root_classes:
-            root_id = root.get("id", "")
-            root_label = root.get("label", "")
-            root_uri = URIRef(f"{namespace}{root_id}")
-
-            print(f"  Root class: {root_label} ({root_id})")
-
-            # Get labels from subclasses
-            labels = get_subclass_labels(graph, root_uri)
-            cat_labels.update(labels)
-            print(f"    Found {len(labels)} labels")
-
-            # Get URIs from subclasses
-            uris = get_subclass_uris(graph, root_uri)
-            cat_uris.extend(uris)
-            print(f"    Found {len(uris)} classes")
-
-        # Generate patterns
-        patterns["categories"][cat_name] = {
-            "label": cat_config.get("label", cat_name),
-            "description": cat_config.get("description", ""),
-            "labels": sorted(cat_labels),
-            "label_count": len(cat_labels),
-            "regex": generate_regex_pattern(cat_labels),
-            "class_uris": sorted(set(cat_uris)),
-            "class_count": len(set(cat_uris)),
-            "values_clause": generate_values_clause(list(set(cat_uris))),
-        }
+    # Workers receive the subclass results once through the initializer
+    initargs = (subclass_cache, namespace, ignore_case)
+    jobs = min(jobs or 1, len(categories))
+    if jobs <= 1:
+        init_category_worker(*initargs)
+        results = list(map(process_category, categories.items()))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_category_worker,
+                                 initargs=initargs) as executor:
+            results = list(executor.map(process_category, categories.items()))
+
+    for cat_name, cat_patterns, progress in results:
+        log.info(f"\nProcessing category: {cat_name}")
+        for line in progress:
+            log.info(line)
+        patterns["categories"][cat_name] = cat_patterns
+
+    if cache_path and missing:
+        save_subclass_cache(cache_path, ontology_sha256, strict_subclass_path, subclass_cache)
 
     return patterns
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Generate patterns from the Catholic Semantic Canon ontology"
-    )
-    parser.add_argument(
-        "--ontology", "-o",
-        type=Path,
-        default=DEFAULT_ONTOLOGY,
-        help=f"Path to ontology file (default: {DEFAULT_ONTOLOGY.name})"
-    )
+def write_patterns(patterns: dict, output_path: Path, build_ac: bool = False,
+                   build_hs: bool = False) -> None:
+    """
+    Write the patterns JSON and optional matcher files, then print a summary.
+
+    Aho-Corasick automata are only built when build_ac is set, Hyperscan
+    databases only when build_hs is set.
+    """
+    # Ensure output directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Precompiled Hyperscan databases alongside the regex, when requested
+    if build_hs and hyperscan is None:
+        log.warning("Warning: hyperscan is not installed, skipping Hyperscan databases")
+    elif build_hs:
+        write_hyperscan_dbs(patterns, output_path)
+
+    # Aho-Corasick automata for literal matching, when requested
+    if build_ac and ahocorasick is None:
+        log.warning("Warning: pyahocorasick is not installed, skipping Aho-Corasick automata")
+    elif build_ac:
+        write_aho_corasick_automata(patterns, output_path)
+
+    # Write output
+    if orjson is not None:
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(patterns, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(patterns, f, indent=2, ensure_ascii=False)
+
+    print(f"\nPatterns written to: {output_path}")
+
+    # Summary
+    print("\n=== Summary ===")
+    for cat_name, cat_data in patterns["categories"].items():
+        print(f"  {cat_name}: {cat_data['label_count']} labels, {cat_data['class_count']} classes")
+
+
+def add_pattern_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the pattern generation options shared with the scripts CLI."""
     parser.add_argument(
         "--config", "-c",
         type=Path,
@@ -378,33 +1129,74 @@ def main():
         default=DEFAULT_OUTPUT,
         help=f"Output path for generated patterns (default: {DEFAULT_OUTPUT.name})"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not write the subclass cache next to the output file"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Worker processes for category generation (default: 1, in-process)"
+    )
+    parser.add_argument(
+        "--build-ac",
+        action="store_true",
+        help="Also write an Aho-Corasick automaton per category (requires pyahocorasick)"
+    )
+    parser.add_argument(
+        "--build-hs",
+        action="store_true",
+        help="Also write a Hyperscan database per category (requires hyperscan)"
+    )
+    parser.add_argument(
+        "--ignore-case",
+        action="store_true",
+        help="Deduplicate labels case-insensitively and emit case-insensitive regexes"
+    )
+    parser.add_argument(
+        "--strict-subclass-path",
+        action="store_true",
+        help="Follow rdfs:subClassOf through non-owl:Class nodes too (full closure)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate patterns from the Catholic Semantic Canon ontology"
+    )
+    parser.add_argument(
+        "--ontology", "-o",
+        type=Path,
+        default=DEFAULT_ONTOLOGY,
+        help=f"Path to ontology file (default: {DEFAULT_ONTOLOGY.name})"
+    )
+    add_pattern_arguments(parser)
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Report loading, caching and per-category progress on stderr"
+    )
 
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
 
     # Validate inputs
     if not args.ontology.exists():
-        print(f"Error: Ontology file not found: {args.ontology}")
+        log.error(f"Error: Ontology file not found: {args.ontology}")
         sys.exit(1)
 
     # Load config
     config = load_config(args.config)
 
-    # Generate patterns
-    patterns = generate_patterns(args.ontology, config)
-
-    # Ensure output directory exists
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-
-    # Write output
-    with open(args.output, "w") as f:
-        json.dump(patterns, f, indent=2, ensure_ascii=False)
-
-    print(f"\nPatterns written to: {args.output}")
+    # Generate patterns, reusing subclass results cached next to the output
+    cache_path = None if args.no_cache else args.output.with_suffix(".cache.json")
+    patterns = generate_patterns(args.ontology, config, cache_path, jobs=args.jobs,
+                                 ignore_case=args.ignore_case,
+                                 strict_subclass_path=args.strict_subclass_path)
 
-    # Summary
-    print("\n=== Summary ===")
-    for cat_name, cat_data in patterns["categories"].items():
-        print(f"  {cat_name}: {cat_data['label_count']} labels, {cat_data['class_count']} classes")
+    write_patterns(patterns, args.output, build_ac=args.build_ac, build_hs=args.build_hs)
 
 
 if __name__ == "__main__":